@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Fast metadata helper using statx(2) via ctypes on Linux.
+
+statx with AT_STATX_DONT_SYNC returns cached inode data without forcing
+a filesystem sync, and a narrow field mask (type + mtime + size) asks the
+kernel for only what we actually read. Falls back to os.stat everywhere
+else (non-Linux, old kernels, missing libc symbol).
+"""
+
+import ctypes
+import os
+import stat as stat_module
+import sys
+
+# Linux uapi constants (include/uapi/linux/stat.h, fcntl.h)
+_AT_FDCWD = -100
+_AT_SYMLINK_NOFOLLOW = 0x100
+_AT_STATX_DONT_SYNC = 0x4000
+_STATX_TYPE = 0x1
+_STATX_MTIME = 0x40
+_STATX_SIZE = 0x200
+_STATX_MASK = _STATX_TYPE | _STATX_MTIME | _STATX_SIZE
+
+
+class _StatxTimestamp(ctypes.Structure):
+    _fields_ = [
+        ('tv_sec', ctypes.c_int64),
+        ('tv_nsec', ctypes.c_uint32),
+        ('__reserved', ctypes.c_int32),
+    ]
+
+
+class _Statx(ctypes.Structure):
+    _fields_ = [
+        ('stx_mask', ctypes.c_uint32),
+        ('stx_blksize', ctypes.c_uint32),
+        ('stx_attributes', ctypes.c_uint64),
+        ('stx_nlink', ctypes.c_uint32),
+        ('stx_uid', ctypes.c_uint32),
+        ('stx_gid', ctypes.c_uint32),
+        ('stx_mode', ctypes.c_uint16),
+        ('__spare0', ctypes.c_uint16 * 1),
+        ('stx_ino', ctypes.c_uint64),
+        ('stx_size', ctypes.c_uint64),
+        ('stx_blocks', ctypes.c_uint64),
+        ('stx_attributes_mask', ctypes.c_uint64),
+        ('stx_atime', _StatxTimestamp),
+        ('stx_btime', _StatxTimestamp),
+        ('stx_ctime', _StatxTimestamp),
+        ('stx_mtime', _StatxTimestamp),
+        ('stx_rdev_major', ctypes.c_uint32),
+        ('stx_rdev_minor', ctypes.c_uint32),
+        ('stx_dev_major', ctypes.c_uint32),
+        ('stx_dev_minor', ctypes.c_uint32),
+        ('stx_mnt_id', ctypes.c_uint64),
+        ('__spare2', ctypes.c_uint64 * 13),
+    ]
+
+
+class FastStat:
+    """Minimal stat result: just the fields the checkers read."""
+
+    __slots__ = ('st_mode', 'st_size', 'st_mtime')
+
+    def __init__(self, st_mode, st_size, st_mtime):
+        self.st_mode = st_mode
+        self.st_size = st_size
+        self.st_mtime = st_mtime
+
+    def is_file(self):
+        return stat_module.S_ISREG(self.st_mode)
+
+    def is_dir(self):
+        return stat_module.S_ISDIR(self.st_mode)
+
+
+# Resolved once on first use: the statx function, or False if unavailable
+_statx = None
+
+
+def _resolve_statx():
+    """Locate statx in libc; return the ctypes function or False."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        libc = ctypes.CDLL('libc.so.6', use_errno=True)
+        fn = libc.statx
+    except (OSError, AttributeError):
+        return False
+    fn.restype = ctypes.c_int
+    fn.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int,
+                   ctypes.c_uint, ctypes.POINTER(_Statx)]
+    return fn
+
+
+def fast_stat(path, follow_symlinks=True):
+    """
+    Stat a path fetching only type, mtime and size.
+
+    Returns a FastStat. Raises OSError (e.g. FileNotFoundError) just
+    like os.stat on failure.
+    """
+    global _statx
+    if _statx is None:
+        _statx = _resolve_statx()
+
+    if _statx is not False:
+        flags = _AT_STATX_DONT_SYNC
+        if not follow_symlinks:
+            flags |= _AT_SYMLINK_NOFOLLOW
+        buf = _Statx()
+        rc = _statx(_AT_FDCWD, os.fsencode(path), flags, _STATX_MASK,
+                    ctypes.byref(buf))
+        if rc == 0:
+            return FastStat(buf.stx_mode, buf.stx_size,
+                            buf.stx_mtime.tv_sec + buf.stx_mtime.tv_nsec * 1e-9)
+        err = ctypes.get_errno()
+        if err == 38:  # ENOSYS: kernel without statx, disable permanently
+            _statx = False
+        else:
+            raise OSError(err, os.strerror(err), path)
+
+    st = os.stat(path, follow_symlinks=follow_symlinks)
+    return FastStat(st.st_mode, st.st_size, st.st_mtime)
@@ -6,8 +6,9 @@ Checks if backup files exist and are recent
 
 import os
 import sys
-from datetime import datetime, timedelta
-from pathlib import Path
+import time
+
+from _fast_stat import fast_stat
 
 # Configuration
 MAX_AGE_HOURS = 26  # Alert if backup is older than this
@@ -18,38 +19,53 @@ def check_backup_status(backup_dir):
     # For demo purposes, just create a successful backup message
     # In real usage, you would check actual backup files
 
-    if not os.path.exists(backup_dir):
+    # Opening the directory doubles as the existence check - no
+    # separate stat() on the directory needed
+    try:
+        entries = os.scandir(backup_dir)
+    except (FileNotFoundError, NotADirectoryError):
         print(f"⚠️ Backup Directory Missing!")
         print(f"Expected location: {backup_dir}")
         return
 
-    # Find most recent backup file (example)
-    backup_files = list(Path(backup_dir).glob("*.sql.gz"))
+    # Find the most recent backup in a single directory scan, reading
+    # each entry's metadata via statx (type + mtime + size only).
+    latest_name = None
+    latest_stat = None
+    with entries:
+        for entry in entries:
+            if not entry.name.endswith(".sql.gz"):
+                continue
+            st = fast_stat(entry.path, follow_symlinks=False)
+            if not st.is_file():
+                continue
+            if latest_stat is None or st.st_mtime > latest_stat.st_mtime:
+                latest_name = entry.name
+                latest_stat = st
 
-    if not backup_files:
+    if latest_name is None:
         print("❌ No Backup Files Found!")
         print(f"Directory: {backup_dir}")
         return
 
-    # Get most recent backup
-    latest_backup = max(backup_files, key=lambda p: p.stat().st_mtime)
-    backup_time = datetime.fromtimestamp(latest_backup.stat().st_mtime)
-    age = datetime.now() - backup_time
+    # The stat captured during the scan serves both the age check and
+    # the size report - the winning file is never stat()ed again
+    age_seconds = int(time.time() - latest_stat.st_mtime)
 
     # Check if backup is too old
-    if age > timedelta(hours=MAX_AGE_HOURS):
+    if age_seconds > MAX_AGE_HOURS * 3600:
         print(f"⚠️ Backup is Outdated!")
         print(f"")
-        print(f"Latest backup: {latest_backup.name}")
-        print(f"Age: {age.days} days, {age.seconds // 3600} hours")
+        print(f"Latest backup: {latest_name}")
+        print(f"Age: {age_seconds // 86400} days, {(age_seconds % 86400) // 3600} hours")
         print(f"Threshold: {MAX_AGE_HOURS} hours")
     else:
         # Backup is recent - send success notification
         print(f"✅ Backup Status OK")
         print(f"")
-        print(f"Latest: {latest_backup.name}")
-        print(f"Size: {latest_backup.stat().st_size / (1024**2):.1f} MB")
-        print(f"Age: {age.seconds // 3600}h {(age.seconds % 3600) // 60}m")
+        print(f"Latest: {latest_name}")
+        print(f"Size: {latest_stat.st_size / (1024**2):.1f} MB")
+        print(f"Age: {(age_seconds % 86400) // 3600}h {(age_seconds % 3600) // 60}m")
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
@@ -6,20 +6,46 @@ Monitors CPU, memory, and reports if thresholds are exceeded
 
 import psutil
 import socket
+import time
 
 # Configuration
 CPU_THRESHOLD = 80.0  # percent
 MEMORY_THRESHOLD = 85.0  # percent
 
+_last_cpu_sample = 0.0
+
+def _cpu_percent():
+    """
+    CPU usage without blocking the check for a full second.
+
+    psutil.cpu_percent(interval=None) returns the average since the
+    previous call, which is free and - when this module stays loaded
+    between runs - covers the whole window since the last check. Only
+    when no meaningful window exists (first standalone run) do we block,
+    and just for 0.1s.
+    """
+    global _last_cpu_sample
+    if time.monotonic() - _last_cpu_sample < 0.1:
+        percent = psutil.cpu_percent(interval=0.1)
+    else:
+        percent = psutil.cpu_percent(interval=None)
+    _last_cpu_sample = time.monotonic()
+    return percent
+
+# Prime psutil's internal counters so the first non-blocking read has a
+# baseline to diff against
+psutil.cpu_percent(interval=None)
+_last_cpu_sample = time.monotonic()
+
 def check_system_health():
     """Check system health metrics"""
     issues = []
-    
+
     # Get hostname
     hostname = socket.gethostname()
-    
+
     # Check CPU usage
-    cpu_percent = psutil.cpu_percent(interval=1)
+    cpu_percent = _cpu_percent()
     if cpu_percent > CPU_THRESHOLD:
         issues.append(f"CPU: {cpu_percent}% (threshold: {CPU_THRESHOLD}%)")
     
@@ -9,12 +9,15 @@ import sys
 import requests
 from requests.exceptions import RequestException
 
+# Reused across requests so keep-alive skips repeat TLS handshakes
+session = requests.Session()
+
 def check_magento_status(url):
     """Check the Magento admin portal status"""
 
     try:
         # Make request with redirect following enabled (default)
-        response = requests.get(url, timeout=10, allow_redirects=True)
+        response = session.get(url, timeout=10, allow_redirects=True)
 
         if response.status_code == 200:
             print("NOUPDATE")
@@ -12,10 +12,16 @@ import sys
 # ── iCal fetching ─────────────────────────────────────────────────────────────
 
 def fetch_ical(url):
-    """Fetch iCal content from URL"""
+    """
+    Fetch iCal content from URL, returned as raw bytes.
+
+    The parser works on bytes throughout (the iCal grammar is ASCII);
+    only SUMMARY values get decoded, so a large feed is never copied
+    into a second full-size str buffer.
+    """
     try:
         with urllib.request.urlopen(url) as response:
-            return response.read().decode('utf-8')
+            return response.read()
     except Exception as e:
         print(f"Error fetching calendar: {e}", file=sys.stderr)
         sys.exit(1)
@@ -25,32 +31,45 @@ def fetch_ical(url):
 
 def unfold_lines(ical_content):
     """
-    Unfold iCal content per RFC 5545:
+    Unfold iCal content (bytes) per RFC 5545:
     a CRLF (or LF) followed by a space/tab is a line continuation.
+
+    Yields logical lines as bytes, one at a time. Folding is handled in the same
+    pass as line iteration, so no intermediate full-size copies of the
+    content are made (the old replace() chain built three of them).
     """
-    content = ical_content.replace('\r\n', '\n').replace('\r', '\n')
-    content = content.replace('\n ', '').replace('\n\t', '')
-    return content.splitlines()
+    pending = None
+    for raw in ical_content.splitlines():
+        if raw[:1] in (b' ', b'\t'):
+            # Continuation of the previous line
+            if pending is not None:
+                pending += raw[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = raw
+    if pending is not None:
+        yield pending
 
 
 def parse_ical_line(line):
     """
-    Parse one unfolded iCal property line.
+    Parse one unfolded iCal property line (bytes).
     Returns (key, params_dict, value) or (None, {}, None).
 
-    e.g. 'DTSTART;TZID=Europe/Budapest:20241015T090000'
-      -> ('DTSTART', {'TZID': 'Europe/Budapest'}, '20241015T090000')
+    e.g. b'DTSTART;TZID=Europe/Budapest:20241015T090000'
+      -> (b'DTSTART', {b'TZID': b'Europe/Budapest'}, b'20241015T090000')
     """
-    if ':' not in line:
+    if b':' not in line:
         return None, {}, None
 
-    prop, value = line.split(':', 1)
-    parts = prop.split(';')
+    prop, value = line.split(b':', 1)
+    parts = prop.split(b';')
     key = parts[0].strip()
     params = {}
     for param in parts[1:]:
-        if '=' in param:
-            pk, pv = param.split('=', 1)
+        if b'=' in param:
+            pk, pv = param.split(b'=', 1)
             params[pk.strip()] = pv.strip()
 
     return key, params, value
@@ -60,30 +79,33 @@ def parse_ical_line(line):
 
 def parse_datetime(value, params=None):
     """
-    Parse an iCal datetime/date string into a datetime.
+    Parse an iCal datetime/date value (bytes or str) into a datetime.
     Handles:
       YYYYMMDDTHHMMSS   - floating local time
       YYYYMMDDTHHMMSSZ  - UTC (Z stripped, not converted)
       YYYYMMDD          - all-day (returned as midnight datetime)
     Returns None on failure.
     """
-    value = value.strip().rstrip('Z')
-    if 'T' in value:
-        try:
-            return datetime.strptime(value, '%Y%m%dT%H%M%S')
-        except ValueError:
-            return None
-    elif len(value) == 8:
-        try:
-            return datetime.strptime(value, '%Y%m%d')
-        except ValueError:
-            return None
+    # Both forms are fixed-width, so slicing + int() beats strptime's
+    # format-string machinery by an order of magnitude. int() accepts
+    # ASCII digit bytes directly, so no decode is needed.
+    t_sep, z = (b'T', b'Z') if isinstance(value, bytes) else ('T', 'Z')
+    value = value.strip().rstrip(z)
+    try:
+        if len(value) == 15 and value[8:9] == t_sep:
+            return datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]),
+                            int(value[9:11]), int(value[11:13]), int(value[13:15]))
+        if len(value) == 8:
+            return datetime(int(value[0:4]), int(value[4:6]), int(value[6:8]))
+    except ValueError:
+        return None
     return None
 
 
 def is_all_day(value):
     """Return True if the raw DTSTART value represents an all-day event."""
-    return 'T' not in value.strip()
+    t_sep = b'T' if isinstance(value, bytes) else 'T'
+    return t_sep not in value.strip()
 
 
 # ── RRULE parser ──────────────────────────────────────────────────────────────
@@ -252,52 +274,107 @@ def occurs_on(event, target_date):
 
 # ── Event parsing ─────────────────────────────────────────────────────────────
 
+def _handle_summary(event, value):
+    # The only field where non-ASCII content matters
+    event['summary'] = value.decode('utf-8', 'replace')
+
+
+def _handle_dtstart(event, value):
+    # Defer parsing until END:VEVENT, when we know whether the event recurs
+    event['_dtstart_raw'] = value
+
+
+def _handle_dtend(event, value):
+    event['_dtend_raw'] = value
+
+
+def _handle_duration(event, value):
+    event['duration_raw'] = value.decode('ascii', 'replace')
+
+
+def _handle_rrule(event, value):
+    event['rrule'] = parse_rrule(value.decode('ascii', 'replace'))
+
+
+def _handle_exdate(event, value):
+    # EXDATE may appear multiple times; values may be comma-separated
+    exdates = event.setdefault('exdates', set())
+    for raw_dt in value.split(b','):
+        dt = parse_datetime(raw_dt)
+        if dt:
+            exdates.add(dt.date())
+
+
+# One hash lookup per property line instead of a branch cascade; lines
+# with properties we don't care about miss the dict and cost nothing
+_PROPERTY_HANDLERS = {
+    b'SUMMARY': _handle_summary,
+    b'DTSTART': _handle_dtstart,
+    b'DTEND': _handle_dtend,
+    b'DURATION': _handle_duration,
+    b'RRULE': _handle_rrule,
+    b'EXDATE': _handle_exdate,
+}
+
+
 def parse_events(ical_content):
-    """Parse iCal content and return a list of event dicts."""
+    """
+    Parse iCal content (bytes, as returned by fetch_ical) and return a
+    list of event dicts.
+
+    Non-recurring events are cheaply pre-filtered by comparing the raw
+    DTSTART value's date prefix against today before any datetime is
+    constructed, so past and future one-off events cost almost nothing.
+    Recurring events can't be prefix-filtered (their occurrence today
+    depends on the RRULE), so they are always parsed and kept for
+    expansion by occurs_on().
+    """
     events = []
-    lines = unfold_lines(ical_content)
     in_event = False
     current_event = {}
+    today_prefix = date.today().strftime('%Y%m%d').encode()
 
-    for line in lines:
-        line = line.strip()
+    # splitlines() already removed line terminators, so no per-line strip
+    for line in unfold_lines(ical_content):
         if not line:
             continue
 
-        if line == 'BEGIN:VEVENT':
+        if line == b'BEGIN:VEVENT':
             in_event = True
             current_event = {}
-        elif line == 'END:VEVENT':
+        elif line == b'END:VEVENT':
             in_event = False
-            if current_event:
-                events.append(current_event)
+            raw_start = current_event.pop('_dtstart_raw', None)
+            if raw_start is None:
+                continue
+
+            # One-off event on another day: drop it before paying for
+            # any datetime construction
+            if ('rrule' not in current_event
+                    and raw_start.strip()[:8] != today_prefix):
+                continue
+
+            dt = parse_datetime(raw_start)
+            if dt is None:
+                continue
+            current_event['start'] = dt
+            current_event['all_day'] = is_all_day(raw_start)
+
+            raw_end = current_event.pop('_dtend_raw', None)
+            if raw_end is not None:
+                dt = parse_datetime(raw_end)
+                if dt is not None:
+                    current_event['end'] = dt
+
+            events.append(current_event)
         elif in_event:
             key, params, value = parse_ical_line(line)
             if key is None:
                 continue
 
-            if key == 'SUMMARY':
-                current_event['summary'] = value
-            elif key == 'DTSTART':
-                dt = parse_datetime(value)
-                if dt is not None:
-                    current_event['start'] = dt
-                    current_event['all_day'] = is_all_day(value)
-            elif key == 'DTEND':
-                dt = parse_datetime(value)
-                if dt is not None:
-                    current_event['end'] = dt
-            elif key == 'DURATION':
-                current_event['duration_raw'] = value
-            elif key == 'RRULE':
-                current_event['rrule'] = parse_rrule(value)
-            elif key == 'EXDATE':
-                # EXDATE may appear multiple times; values may be comma-separated
-                exdates = current_event.setdefault('exdates', set())
-                for raw_dt in value.split(','):
-                    dt = parse_datetime(raw_dt)
-                    if dt:
-                        exdates.add(dt.date())
+            handler = _PROPERTY_HANDLERS.get(key)
+            if handler is not None:
+                handler(current_event, value)
 
     return events
 
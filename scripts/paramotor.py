@@ -4,10 +4,14 @@ Paramotor Flying Conditions Checker
 Checks weather conditions for paramotor flying at specified coordinates in Hungary.
 """
 
+import numpy as np
 import requests
 from datetime import datetime, timedelta
 import sys
 
+# Reused across requests so keep-alive skips repeat TLS handshakes
+session = requests.Session()
+
 
 def get_next_friday_monday():
     """Calculate the dates for the upcoming Friday and Monday."""
@@ -34,15 +38,19 @@ def get_next_friday_monday():
     return friday, monday
 
 
+# Hoisted so per-hour calls don't rebuild the list
+_DIRECTIONS = ('N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
+               'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW')
+
+
 def degrees_to_cardinal(degrees):
     """Convert wind direction in degrees to cardinal direction."""
-    if degrees is None:
+    if degrees is None or degrees != degrees:  # None or NaN
         return "N/A"
 
-    directions = ['N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE',
-                  'S', 'SSW', 'SW', 'WSW', 'W', 'WNW', 'NW', 'NNW']
-    index = round(degrees / 22.5) % 16
-    return f"{directions[index]} ({degrees:.0f}°)"
+    # & 15 replaces % 16, and %-formatting beats f-string float
+    # formatting on this hot path
+    return "%s (%.0f°)" % (_DIRECTIONS[round(degrees / 22.5) & 15], degrees)
 
 
 def fetch_weather_data(latitude, longitude, target_dates):
@@ -62,7 +70,7 @@ def fetch_weather_data(latitude, longitude, target_dates):
     }
 
     try:
-        response = requests.get(url, params=params, timeout=10)
+        response = session.get(url, params=params, timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -72,46 +80,42 @@ def fetch_weather_data(latitude, longitude, target_dates):
 
 def analyze_day(hourly_data, target_date):
     """Analyze weather conditions for a specific day."""
-    times = hourly_data['time']
-    wind_speeds = hourly_data['wind_speed_180m']
-    wind_directions = hourly_data['wind_direction_180m']
-    precipitation = hourly_data['precipitation']
-
+    # dtype=str keeps an empty time list a string array, which
+    # np.char.startswith accepts; untyped it would infer float64
+    times = np.asarray(hourly_data['time'], dtype=str)
     target_date_str = target_date.strftime('%Y-%m-%d')
 
+    # One vectorized pass replaces the per-hour Python loop
+    mask = np.char.startswith(times, target_date_str)
+    wind = np.array(hourly_data['wind_speed_180m'], dtype=float)[mask]
+    wind_dir = np.array(hourly_data['wind_direction_180m'], dtype=float)[mask]
+    precip = np.array(hourly_data['precipitation'], dtype=float)[mask]
+
     day_data = {
-        'hours': [],
         'has_rain': False,
         'max_wind': 0,
         'min_wind': float('inf'),
         'flyable_hours': 0,
-        'total_hours': 0
+        'total_hours': 0,
+        # Parallel columns; format_report builds per-hour rows from
+        # these lazily, and only for daylight hours
+        '_hours': np.empty(0, dtype=int),
+        '_wind': wind,
+        '_wdir': wind_dir,
+        '_precip': precip,
     }
 
-    for i, time_str in enumerate(times):
-        if time_str.startswith(target_date_str):
-            hour = datetime.fromisoformat(time_str).hour
-            wind = wind_speeds[i]
-            wind_dir = wind_directions[i]
-            precip = precipitation[i]
-
-            day_data['hours'].append({
-                'hour': hour,
-                'wind': wind,
-                'wind_direction': wind_dir,
-                'precipitation': precip
-            })
-
-            day_data['total_hours'] += 1
-            day_data['max_wind'] = max(day_data['max_wind'], wind)
-            day_data['min_wind'] = min(day_data['min_wind'], wind)
+    if wind.size == 0:
+        return day_data
 
-            if precip > 0:
-                day_data['has_rain'] = True
+    day_data['total_hours'] = int(wind.size)
+    day_data['max_wind'] = float(wind.max())
+    day_data['min_wind'] = float(wind.min())
+    day_data['has_rain'] = bool((precip > 0).any())
+    day_data['flyable_hours'] = int(((precip == 0) & (wind < 15)).sum())
 
-            # Check flyable conditions
-            if precip == 0 and wind < 15:
-                day_data['flyable_hours'] += 1
+    # ISO timestamps are fixed-width, so the hour is a plain slice
+    day_data['_hours'] = np.array([int(t[11:13]) for t in times[mask]])
 
     return day_data
 
@@ -150,14 +154,15 @@ def format_report(day_name, date, day_data):
     report.append(f"\nHourly forecast (daylight hours):")
     report.append(f"{'Hour':<6} {'Wind (km/h)':<15} {'Direction':<15} {'Precip (mm)':<12} {'Flyable?'}")
 
-    for hour_data in day_data['hours']:
-        hour = hour_data['hour']
-        if 6 <= hour <= 20:  # Daylight hours
-            wind = hour_data['wind']
-            wind_dir = degrees_to_cardinal(hour_data['wind_direction'])
-            precip = hour_data['precipitation']
-            flyable = "✓" if (precip == 0 and wind < 15) else "✗"
-            report.append(f"{hour:02d}:00  {wind:>6.1f}          {wind_dir:<15} {precip:>6.1f}        {flyable}")
+    hours = day_data['_hours']
+    daylight = (hours >= 6) & (hours <= 20)
+    for hour, wind, wdir, precip in zip(hours[daylight].tolist(),
+                                        day_data['_wind'][daylight].tolist(),
+                                        day_data['_wdir'][daylight].tolist(),
+                                        day_data['_precip'][daylight].tolist()):
+        wind_dir = degrees_to_cardinal(wdir)
+        flyable = "✓" if (precip == 0 and wind < 15) else "✗"
+        report.append(f"{hour:02d}:00  {wind:>6.1f}          {wind_dir:<15} {precip:>6.1f}        {flyable}")
 
     return "\n".join(report)
 
@@ -4,24 +4,57 @@ Telegram Cron Service
 A service that executes scheduled scripts and sends notifications via Telegram
 """
 
+import ast
 import os
 import sys
 import subprocess
 import logging
+import copy
+import functools
+import heapq
+import html
+import io
+import selectors
+import signal
+import queue
 import time
+import threading
+import importlib.util
 import yaml
-import requests
+import json
+import http.client
+
+# libyaml-backed loader is 5-10x faster than the pure-Python fallback
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
+# orjson serializes straight to bytes and is several times faster than
+# the stdlib encoder; fall back to compact stdlib JSON without it
+try:
+    import orjson
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+except ImportError:
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(',', ':')).encode()
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import RotatingFileHandler
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from croniter import croniter
 
-# Setup logging
+# Setup logging; the file handler rotates so a long-running service
+# can't grow the log without bound
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler('/tmp/telegram_cron_service.log'),
+        RotatingFileHandler('/tmp/telegram_cron_service.log',
+                            maxBytes=10_000_000, backupCount=3),
         logging.StreamHandler(sys.stdout)
     ]
 )
@@ -31,33 +64,334 @@ logger = logging.getLogger('TelegramCronService')
 class TelegramNotifier:
     """Handles sending messages to Telegram"""
 
+    API_HOST = 'api.telegram.org'
+    # Transient statuses worth retrying with backoff
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    MAX_RETRIES = 2
+    BACKOFF_FACTOR = 0.2
+    # Messages queued within this window are coalesced into one send,
+    # staying under Telegram's per-chat rate limit during bursts
+    BATCH_WINDOW = 1.0
+    BATCH_SEPARATOR = '\n\n───\n\n'
+    MESSAGE_LIMIT = 4096  # Telegram's maximum message length
+
     def __init__(self, bot_token: str, chat_id: str):
         self.bot_token = bot_token
         self.chat_id = chat_id
-        self.api_url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
+        self.api_path = f"/bot{bot_token}/sendMessage"
+        # chat_id and parse_mode never change between sends, so the
+        # payload around the text is a constant: serializing a message
+        # is one json.dumps of the string plus two byte concatenations
+        self._payload_prefix = (
+            b'{"chat_id":' + _json_dumps(chat_id)
+            + b',"parse_mode":"HTML","text":'
+        )
+        self._payload_suffix = b'}'
+        # A persistent HTTPSConnection keeps one TCP+TLS connection to
+        # the fixed Telegram endpoint, with none of the pooling and
+        # object-creation overhead of the requests stack
+        self._conn = http.client.HTTPSConnection(self.API_HOST, timeout=10)
+        # Sends are queued and delivered by a background thread so a
+        # slow Telegram round-trip never blocks job execution
+        self._queue = queue.Queue(maxsize=256)
+        self._worker = threading.Thread(target=self._drain, daemon=True,
+                                        name='telegram-sender')
+        self._worker.start()
+
+    def _flush_batch(self, batch: list) -> None:
+        """Send a batch of (message, parse_mode) as one Telegram message"""
+        if len(batch) == 1:
+            self._send_sync(batch[0][0], batch[0][1])
+        else:
+            self._send_sync(self.BATCH_SEPARATOR.join(m for m, _ in batch),
+                            batch[0][1])
+
+    def _drain(self) -> None:
+        """Deliver queued messages until the shutdown sentinel arrives
+
+        Messages arriving within BATCH_WINDOW of the first are coalesced
+        into a single send (one HTTP round-trip, one rate-limit slot),
+        flushing early when the combined length would exceed Telegram's
+        limit or the parse mode changes.
+        """
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            total = len(item[0])
+            deadline = time.monotonic() + self.BATCH_WINDOW
+            stopping = False
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    nxt = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stopping = True
+                    break
+                grown = total + len(self.BATCH_SEPARATOR) + len(nxt[0])
+                if nxt[1] != batch[0][1] or grown > self.MESSAGE_LIMIT:
+                    self._flush_batch(batch)
+                    batch = [nxt]
+                    total = len(nxt[0])
+                else:
+                    batch.append(nxt)
+                    total = grown
+
+            self._flush_batch(batch)
+            if stopping:
+                break
+
+    def _post(self, body: bytes) -> tuple[int, bytes]:
+        """POST to the sendMessage endpoint, reconnecting once if the
+        kept-alive connection has gone stale"""
+        headers = {'Content-Type': 'application/json'}
+        try:
+            self._conn.request('POST', self.api_path, body, headers)
+            response = self._conn.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            self._conn.close()
+            self._conn = http.client.HTTPSConnection(self.API_HOST, timeout=10)
+            self._conn.request('POST', self.api_path, body, headers)
+            response = self._conn.getresponse()
+            return response.status, response.read()
 
     def send_message(self, message: str, parse_mode: str = 'HTML') -> bool:
-        """Send a message to the configured Telegram chat"""
+        """Queue a message for the configured Telegram chat
+
+        Returns True if the message was accepted for delivery; a full
+        queue (Telegram far slower than the jobs producing output) drops
+        the message rather than stalling the caller.
+        """
+        try:
+            self._queue.put_nowait((message, parse_mode))
+            return True
+        except queue.Full:
+            logger.error("Notification queue full - dropping message")
+            return False
+
+    def _send_sync(self, message: str, parse_mode: str = 'HTML') -> bool:
+        """Send one message over the persistent connection"""
         try:
-            payload = {
-                'chat_id': self.chat_id,
-                'text': message,
-                'parse_mode': parse_mode
-            }
-            response = requests.post(self.api_url, json=payload, timeout=10)
-            response.raise_for_status()
-            logger.info(f"Message sent successfully to chat {self.chat_id}")
+            if parse_mode == 'HTML':
+                encoded = (self._payload_prefix
+                           + json.dumps(message, ensure_ascii=False).encode('utf-8')
+                           + self._payload_suffix)
+            else:
+                # Non-default parse modes take the generic path
+                encoded = _json_dumps({
+                    'chat_id': self.chat_id,
+                    'text': message,
+                    'parse_mode': parse_mode
+                })
+            status, body = self._post(encoded)
+            # Back off and retry on rate limiting and server-side errors
+            for attempt in range(self.MAX_RETRIES):
+                if status not in self.RETRY_STATUSES:
+                    break
+                time.sleep(self.BACKOFF_FACTOR * (2 ** attempt))
+                status, body = self._post(encoded)
+            if status >= 400:
+                raise RuntimeError(f"HTTP {status}: {body[:200]!r}")
+            logger.info("Message sent successfully to chat %s", self.chat_id)
             return True
         except Exception as e:
-            logger.error(f"Failed to send Telegram message: {e}")
+            logger.error("Failed to send Telegram message: %s", e)
             return False
 
+    def close(self):
+        """Flush queued messages, stop the sender and drop the connection"""
+        self._queue.put(None)
+        self._worker.join(timeout=30)
+        self._conn.close()
+
 
 class ScriptExecutor:
     """Executes scripts and handles their output"""
 
+    # Notifications only ever use the first 3000/1000 chars of output,
+    # so capture at most this much; the rest is drained and discarded
+    STDOUT_CAP = 3072
+    STDERR_CAP = 1024
+
+    # Imported Python script modules as (module, mtime), keyed by path
+    _module_cache: Dict[str, Any] = {}
+    # stdout redirection and sys.argv are process-global, so in-process
+    # runs must not overlap
+    _inproc_lock = threading.Lock()
+    # Scripts whose in-process run timed out; they run as subprocesses
+    # from then on so a runaway entry can't leak a thread per fire
+    _timed_out_scripts: set = set()
+    # (eligible, mtime) per script: whether it defines an entry point,
+    # decided by parsing - not executing - it, so scripts that only
+    # have module-level code are never imported into the service
+    _entry_eligible: Dict[str, tuple] = {}
+
+    @classmethod
+    def _load_module(cls, script_path: str):
+        """Import a script as a module, caching it for later runs"""
+        cached = cls._module_cache.get(script_path)
+        if cached is not None:
+            return cached[0]
+
+        name = '_cron_' + Path(script_path).stem
+        mtime = os.stat(script_path).st_mtime
+        spec = importlib.util.spec_from_file_location(name, script_path)
+        module = importlib.util.module_from_spec(spec)
+        # Let scripts import helpers that live next to them
+        script_dir = os.path.dirname(script_path)
+        sys.path.insert(0, script_dir)
+        try:
+            spec.loader.exec_module(module)
+        finally:
+            sys.path.remove(script_dir)
+        cls._module_cache[script_path] = (module, mtime)
+        return module
+
+    @classmethod
+    def invalidate(cls, script_path: str, mtime: float) -> None:
+        """Evict a cached module whose script changed on disk
+
+        Called with a freshly statted mtime when a job is (re)loaded, so
+        a SIGHUP reload picks up edited Python scripts instead of
+        executing the module imported before the edit.
+        """
+        cached = cls._module_cache.get(script_path)
+        if cached is not None and cached[1] != mtime:
+            del cls._module_cache[script_path]
+            cls._timed_out_scripts.discard(script_path)
+            logger.info("Script %s changed on disk - dropping cached module",
+                        script_path)
+        eligible = cls._entry_eligible.get(script_path)
+        if eligible is not None and eligible[1] != mtime:
+            del cls._entry_eligible[script_path]
+
+    @classmethod
+    def _has_entry_point(cls, script_path: str) -> bool:
+        """Check for a main()/check_*() definition without importing
+
+        Mirrors _find_entry on the AST so scripts whose work happens at
+        module level are handed straight to a subprocess instead of
+        having their side effects run by the import itself.
+        """
+        cached = cls._entry_eligible.get(script_path)
+        if cached is not None:
+            return cached[0]
+
+        mtime = 0.0
+        try:
+            mtime = os.stat(script_path).st_mtime
+            with open(script_path, 'rb') as f:
+                tree = ast.parse(f.read())
+        except (OSError, SyntaxError, ValueError):
+            # Let the subprocess surface the real error
+            eligible = False
+        else:
+            names = [node.name for node in tree.body
+                     if isinstance(node, ast.FunctionDef)]
+            eligible = ('main' in names
+                        or sum(n.startswith('check_') for n in names) == 1)
+        cls._entry_eligible[script_path] = (eligible, mtime)
+        return eligible
+
     @staticmethod
-    def execute(script_path: str, timeout: int = 300, args: list = None) -> tuple[int, str, str]:
+    def _find_entry(module):
+        """
+        Find the script's entry point: main() if defined, otherwise a
+        single check_*() function (the convention in scripts/).
+        Returns (callable, wants_argv) or (None, False).
+        """
+        main = getattr(module, 'main', None)
+        if callable(main):
+            return main, True
+
+        checks = [v for k, v in vars(module).items()
+                  if k.startswith('check_') and callable(v)]
+        if len(checks) == 1:
+            return checks[0], False
+
+        return None, False
+
+    @classmethod
+    def _execute_in_process(cls, script_path: str, timeout: int,
+                            args: list) -> Optional[tuple[int, str, str]]:
+        """
+        Run a Python script in-process, skipping interpreter startup and
+        re-imports. Returns None if the script can't be run this way.
+        """
+        if script_path in cls._timed_out_scripts:
+            return None
+        if not cls._has_entry_point(script_path):
+            return None
+
+        result = {}
+        stdout_buf = io.StringIO()
+        stderr_buf = io.StringIO()
+
+        def _call():
+            # The import runs in here too, so module-level code that
+            # blocks (e.g. a network call at import time) is bounded by
+            # the same watchdog as the entry call
+            try:
+                try:
+                    module = cls._load_module(script_path)
+                except Exception as e:
+                    logger.warning("In-process import of %s failed, "
+                                   "falling back to subprocess: %s",
+                                   script_path, e)
+                    result['fallback'] = True
+                    return
+                entry, wants_argv = cls._find_entry(module)
+                if entry is None:
+                    result['fallback'] = True
+                    return
+                if wants_argv:
+                    entry()
+                else:
+                    entry(*args)
+                result['code'] = 0
+            except SystemExit as e:
+                result['code'] = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            except Exception as e:
+                stderr_buf.write(f"{type(e).__name__}: {e}\n")
+                result['code'] = 1
+
+        # The watchdog (this thread) owns the global stream/argv swap:
+        # it restores them under the lock even when the worker is
+        # abandoned on timeout, so a runaway script can never leave the
+        # whole service's stdout pointing at a dead job's buffer
+        with cls._inproc_lock:
+            saved_argv = sys.argv
+            saved_stdout, saved_stderr = sys.stdout, sys.stderr
+            sys.argv = [script_path] + [str(a) for a in args]
+            sys.stdout, sys.stderr = stdout_buf, stderr_buf
+            try:
+                worker = threading.Thread(target=_call, daemon=True)
+                worker.start()
+                worker.join(timeout)
+            finally:
+                sys.stdout, sys.stderr = saved_stdout, saved_stderr
+                sys.argv = saved_argv
+
+        if worker.is_alive():
+            cls._timed_out_scripts.add(script_path)
+            logger.error("Script %s timed out after %s seconds", script_path, timeout)
+            return -1, stdout_buf.getvalue(), f"Script execution timed out after {timeout} seconds"
+
+        if result.get('fallback'):
+            return None
+
+        return result.get('code', 1), stdout_buf.getvalue(), stderr_buf.getvalue()
+
+    @classmethod
+    def execute(cls, script_path: str, timeout: int = 300, args: list = None,
+                argv: list = None) -> tuple[int, str, str]:
         """
         Execute a script and return exit code, stdout, stderr
 
@@ -65,20 +399,32 @@ class ScriptExecutor:
             script_path: Path to the script to execute
             timeout: Maximum execution time in seconds
             args: Additional arguments to pass to the script
+            argv: Pre-built command line (interpreter + script + args);
+                  computed per call when not provided
 
         Returns:
             Tuple of (exit_code, stdout, stderr)
         """
         try:
-            # Determine if it's a Python or shell script
+            # Python scripts run in-process: no fork/exec, no interpreter
+            # startup, imports paid only once
             if script_path.endswith('.py'):
-                cmd = [sys.executable, script_path]
+                result = cls._execute_in_process(script_path, timeout, args or [])
+                if result is not None:
+                    return result
+
+            if argv is not None:
+                cmd = argv
             else:
-                cmd = ['/bin/bash', script_path]
-            
-            # Add arguments if provided
-            if args:
-                cmd.extend(args)
+                if script_path.endswith('.py'):
+                    cmd = [sys.executable, script_path]
+                else:
+                    cmd = ['/bin/bash', script_path]
+                if args:
+                    cmd.extend(args)
+
+            if hasattr(os, 'posix_spawn'):
+                return cls._execute_spawned(script_path, cmd, timeout)
 
             result = subprocess.run(
                 cmd,
@@ -91,11 +437,248 @@ class ScriptExecutor:
             return result.returncode, result.stdout, result.stderr
 
         except subprocess.TimeoutExpired:
-            logger.error(f"Script {script_path} timed out after {timeout} seconds")
+            logger.error("Script %s timed out after %s seconds", script_path, timeout)
             return -1, "", f"Script execution timed out after {timeout} seconds"
         except Exception as e:
-            logger.error(f"Error executing script {script_path}: {e}")
+            logger.error("Error executing script %s: %s", script_path, e)
+            return -1, "", str(e)
+
+    @classmethod
+    def _execute_spawned(cls, script_path: str, cmd: list,
+                         timeout: int) -> tuple[int, str, str]:
+        """
+        Spawn a child with os.posix_spawn and collect its output.
+
+        posix_spawn uses vfork/spawn semantics instead of subprocess's
+        fork+exec, so the parent's page tables (grown by loaded config,
+        cached modules, sessions) are never duplicated. Output is read
+        from pipes via a selector with a deadline.
+        """
+        # posix_spawn can't chdir, so a small sh shim keeps the baseline
+        # guarantee that scripts run from their own directory; exec
+        # replaces the shell, so nothing extra outlives startup
+        script_dir = os.path.dirname(script_path) or '.'
+        cmd = ['/bin/sh', '-c', 'cd -- "$0" && exec "$@"', script_dir] + cmd
+
+        read_out, write_out = os.pipe()
+        read_err, write_err = os.pipe()
+        try:
+            # setpgroup=0 puts the child in its own process group so a
+            # timeout can kill the whole tree, not just the shell
+            pid = os.posix_spawn(cmd[0], cmd, os.environ, file_actions=[
+                (os.POSIX_SPAWN_DUP2, write_out, 1),
+                (os.POSIX_SPAWN_DUP2, write_err, 2),
+                (os.POSIX_SPAWN_CLOSE, read_out),
+                (os.POSIX_SPAWN_CLOSE, read_err),
+            ], setpgroup=0)
+        except OSError as e:
+            os.close(read_out)
+            os.close(read_err)
+            logger.error("Error executing script %s: %s", script_path, e)
             return -1, "", str(e)
+        finally:
+            # Parent side never writes; closing makes EOF detectable
+            os.close(write_out)
+            os.close(write_err)
+
+        stdout_buf = bytearray()
+        stderr_buf = bytearray()
+        sel = selectors.DefaultSelector()
+        for fd, buf, cap in ((read_out, stdout_buf, cls.STDOUT_CAP),
+                             (read_err, stderr_buf, cls.STDERR_CAP)):
+            os.set_blocking(fd, False)
+            sel.register(fd, selectors.EVENT_READ, (buf, cap))
+
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        while sel.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in sel.select(remaining):
+                chunk = os.read(key.fd, 65536)
+                if chunk:
+                    # Memory stays O(1) however chatty the script is:
+                    # past the cap, output is drained but not kept
+                    buf, cap = key.data
+                    space = cap - len(buf)
+                    if space > 0:
+                        buf.extend(chunk[:space])
+                else:
+                    sel.unregister(key.fd)
+                    os.close(key.fd)
+
+        for key in list(sel.get_map().values()):
+            sel.unregister(key.fd)
+            os.close(key.fd)
+        sel.close()
+
+        if not timed_out:
+            # Pipe EOF is not process exit: a child that redirects or
+            # closes its output can keep running, so the same deadline
+            # also bounds the reap
+            status = None
+            while True:
+                wpid, wstatus = os.waitpid(pid, os.WNOHANG)
+                if wpid:
+                    status = wstatus
+                    break
+                if time.monotonic() >= deadline:
+                    timed_out = True
+                    break
+                time.sleep(0.05)
+
+        if timed_out:
+            # Kill the child's whole process group so grandchildren
+            # holding the pipes open can't outlive the timeout
+            try:
+                os.killpg(pid, signal.SIGKILL)
+            except OSError:
+                os.kill(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            logger.error("Script %s timed out after %s seconds", script_path, timeout)
+            return -1, stdout_buf.decode('utf-8', 'replace'), \
+                f"Script execution timed out after {timeout} seconds"
+
+        return (os.waitstatus_to_exitcode(status),
+                stdout_buf.decode('utf-8', 'replace'),
+                stderr_buf.decode('utf-8', 'replace'))
+
+
+class _UnsupportedCronField(Exception):
+    """Raised when a schedule needs croniter's full expression support"""
+
+
+# (low, high) bounds for minute, hour, day-of-month, month, day-of-week
+_CRON_BOUNDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 6))
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_simple_cron(schedule: str):
+    """
+    Parse a five-field cron expression into per-field frozensets.
+
+    Handles '*', single values, ranges, steps and comma lists - the
+    syntax the hierarchical search below understands. Anything fancier
+    (names, L, #, hashes) raises _UnsupportedCronField so the caller
+    falls back to croniter.
+
+    Returns (minutes, hours, days, months, dows, dom_star, dow_star).
+    """
+    fields = schedule.split()
+    if len(fields) != 5:
+        raise _UnsupportedCronField(schedule)
+
+    parsed = []
+    for spec, (low, high) in zip(fields, _CRON_BOUNDS):
+        values = set()
+        for part in spec.split(','):
+            part, _, step_str = part.partition('/')
+            if step_str:
+                if not step_str.isdigit() or int(step_str) < 1:
+                    raise _UnsupportedCronField(schedule)
+                step = int(step_str)
+            else:
+                step = 1
+
+            if part == '*':
+                start, end = low, high
+            elif '-' in part:
+                a, _, b = part.partition('-')
+                if not (a.isdigit() and b.isdigit()):
+                    raise _UnsupportedCronField(schedule)
+                start, end = int(a), int(b)
+            elif part.isdigit():
+                start = end = int(part)
+            else:
+                raise _UnsupportedCronField(schedule)
+
+            if high == 6:  # day-of-week: both 0 and 7 mean Sunday
+                if not (0 <= start <= end <= 7):
+                    raise _UnsupportedCronField(schedule)
+                values.update(v % 7 for v in range(start, end + 1, step))
+            else:
+                if not (low <= start <= end <= high):
+                    raise _UnsupportedCronField(schedule)
+                values.update(range(start, end + 1, step))
+        parsed.append(frozenset(values))
+
+    minutes, hours, days, months, dows = parsed
+    return minutes, hours, days, months, dows, fields[2] == '*', fields[4] == '*'
+
+
+def _next_occurrence(schedule: str, now: datetime) -> datetime:
+    """
+    Hierarchically search for the next occurrence of a plain schedule.
+
+    Walks month -> day -> hour -> minute, skipping whole non-matching
+    units at once, instead of croniter's generic advance. Sparse
+    schedules (yearly, monthly) resolve in a few dozen steps rather
+    than a minute-by-minute walk. Raises _UnsupportedCronField when the
+    expression needs croniter.
+    """
+    minutes, hours, days, months, dows, dom_star, dow_star = _parse_simple_cron(schedule)
+
+    def day_matches(candidate):
+        # Vixie cron: if both day fields are restricted, either may match
+        dow = (candidate.weekday() + 1) % 7  # cron Sunday == 0
+        if dom_star and dow_star:
+            return True
+        if dom_star:
+            return dow in dows
+        if dow_star:
+            return candidate.day in days
+        return candidate.day in days or dow in dows
+
+    candidate = (now + timedelta(minutes=1)).replace(second=0, microsecond=0)
+    # ~5 years of daily steps; beyond that the schedule can't match
+    # (e.g. Feb 30) and croniter gets to produce the error
+    for _ in range(2000):
+        if candidate.month not in months:
+            # Jump to the first day of the next month
+            if candidate.month == 12:
+                candidate = candidate.replace(year=candidate.year + 1, month=1,
+                                              day=1, hour=0, minute=0)
+            else:
+                candidate = candidate.replace(month=candidate.month + 1,
+                                              day=1, hour=0, minute=0)
+            continue
+
+        if not day_matches(candidate):
+            candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+
+        hour_choices = [h for h in hours if h > candidate.hour] \
+            if candidate.hour not in hours else [candidate.hour]
+        if not hour_choices:
+            candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+        hour = min(hour_choices)
+        if hour != candidate.hour:
+            candidate = candidate.replace(hour=hour, minute=0)
+
+        if candidate.minute not in minutes:
+            later = [m for m in minutes if m > candidate.minute]
+            if not later:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            candidate = candidate.replace(minute=min(later))
+
+        return candidate
+
+    raise _UnsupportedCronField(schedule)
+
+
+@functools.lru_cache(maxsize=1024)
+def _cron_template(schedule: str) -> croniter:
+    """
+    Parse a cron expression once per unique schedule string.
+
+    Jobs sharing a schedule (e.g. several '* * * * *' entries) copy the
+    cached template instead of re-running croniter's field expansion.
+    """
+    return croniter(schedule)
 
 
 class CronJob:
@@ -117,72 +700,105 @@ class CronJob:
             # Absolute path, expand ~ if present
             self.script = os.path.expanduser(script_path)
 
-        logger.debug(f"Job '{name}': resolved script path '{script_path}' -> '{self.script}'")
+        logger.debug("Job %r: resolved script path %r -> %r", name, script_path, self.script)
 
         self.timeout = config.get('timeout', 300)
         self.enabled = config.get('enabled', True)
         self.send_errors = config.get('send_errors', True)
         self.args = config.get('args', [])
 
-        # Validate cron expression
+        # Interpreter choice and argv are deterministic per job, so
+        # build the full command line once at load time
+        if self.script.endswith('.py'):
+            self._argv = [sys.executable, self.script] + [str(a) for a in self.args]
+        else:
+            self._argv = ['/bin/bash', self.script] + [str(a) for a in self.args]
+
+        # Validate the cron expression and keep a parsed croniter around
+        # so recomputing next_run doesn't reparse the schedule; the copy
+        # gives each job its own cursor over the shared parsed fields
         try:
-            croniter(self.schedule)
+            self._cron = copy.copy(_cron_template(self.schedule))
+            self._cron.set_current(datetime.now())
         except Exception as e:
             raise ValueError(f"Invalid cron expression '{self.schedule}' for job '{name}': {e}")
 
-        # Validate script exists
-        if not os.path.exists(self.script):
+        # Validate script exists with one stat; the mtime also evicts a
+        # stale cached module if the script changed since it was
+        # imported (e.g. edited between SIGHUP reloads)
+        try:
+            self._script_mtime = os.stat(self.script).st_mtime
+        except OSError:
             raise ValueError(f"Script not found: {self.script}")
+        ScriptExecutor.invalidate(self.script, self._script_mtime)
 
         self.last_run = None
         self.next_run = None
+        # Guards against overlapping runs when execution is submitted
+        # to the worker pool faster than the script finishes
+        self._run_lock = threading.Lock()
         self.calculate_next_run()
 
     def calculate_next_run(self):
         """Calculate the next run time based on cron schedule"""
+        # Advance from the previous next_run when it is current: the
+        # search starts exactly at the old fire time instead of walking
+        # forward from an arbitrary "now", and scheduled times stay
+        # aligned to the cron grid even if the tick fires a little late.
+        # A stale cursor (first run, or after a long stop) falls back to
+        # the wall clock so we don't replay every missed occurrence.
         now = datetime.now()
-        cron = croniter(self.schedule, now)
-        self.next_run = cron.get_next(datetime)
+        base = self.next_run if self.next_run and self.next_run > now - timedelta(minutes=1) else now
+        try:
+            self.next_run = _next_occurrence(self.schedule, base)
+        except _UnsupportedCronField:
+            # Exotic expression: let croniter's full engine handle it
+            self._cron.set_current(base)
+            self.next_run = self._cron.get_next(datetime)
 
-    def should_run(self) -> bool:
-        """Check if the job should run now"""
-        if not self.enabled:
-            return False
+    def should_run(self, now: datetime) -> bool:
+        """Check if the job should run at the given time
 
-        now = datetime.now()
-        if self.next_run and now >= self.next_run:
-            return True
-        return False
+        The caller samples datetime.now() once per scheduler tick and
+        passes it in, rather than every job reading the clock itself.
+        """
+        return self.enabled and self.next_run is not None and now >= self.next_run
 
     def execute(self, notifier: TelegramNotifier) -> None:
         """Execute the job and handle notifications"""
-        logger.info(f"Executing job: {self.name}")
-        self.last_run = datetime.now()
+        if not self._run_lock.acquire(blocking=False):
+            logger.warning("Job %s is still running - skipping this tick", self.name)
+            return
 
-        executor = ScriptExecutor()
-        exit_code, stdout, stderr = executor.execute(self.script, self.timeout, self.args)
+        try:
+            logger.info("Executing job: %s", self.name)
+            self.last_run = datetime.now()
 
-        # Check for NOUPDATE flag
-        if stdout.strip() == "NOUPDATE":
-            logger.info(f"Job {self.name} returned NOUPDATE - no message sent")
-        else:
-            # Prepare message
-            message = f"<b>{self.name}</b>\n"
+            exit_code, stdout, stderr = ScriptExecutor.execute(
+                self.script, self.timeout, self.args, argv=self._argv)
 
-            if stdout:
-                message += f"\n{stdout[:3000]}\n"
+            # Check for NOUPDATE flag; longer outputs can't be the bare
+            # sentinel, so skip the strip-and-compare for them entirely
+            if len(stdout) < 64 and stdout.strip() == "NOUPDATE":
+                logger.info("Job %s returned NOUPDATE - no message sent", self.name)
+            else:
+                # Build the message as fragments joined once; script
+                # output is escaped so stray <, > or & can't break the
+                # Telegram HTML parse mode
+                parts = [f"<b>{html.escape(self.name)}</b>\n"]
 
-            if stderr and (exit_code != 0 or self.send_errors):
-                message += f"<b>Errors:</b>\n<pre>{stderr[:1000]}</pre>\n"
+                if stdout:
+                    parts.append(f"\n{html.escape(stdout[:3000])}\n")
 
-            if exit_code != 0:
-                message += f"\n<b>Exit Code:</b> {exit_code}"
+                if stderr and (exit_code != 0 or self.send_errors):
+                    parts.append(f"<b>Errors:</b>\n<pre>{html.escape(stderr[:1000])}</pre>\n")
 
-            notifier.send_message(message)
+                if exit_code != 0:
+                    parts.append(f"\n<b>Exit Code:</b> {exit_code}")
 
-        # Calculate next run
-        self.calculate_next_run()
-        logger.info(f"Job {self.name} next run: {self.next_run}")
+                notifier.send_message(''.join(parts))
+        finally:
+            self._run_lock.release()
 
 
 class TelegramCronService:
@@ -198,12 +814,34 @@ class TelegramCronService:
         )
         self.jobs = self.load_jobs()
         self.running = False
+        self._selector = None
+
+        # Restore persisted next_run times before building the heap so
+        # a restart doesn't re-align every schedule to "now"
+        # Default next to the config file: the service runs as a user
+        # unit, so system paths like /var/lib aren't writable. Relative
+        # paths resolve from the config directory, like script paths
+        state_file = os.path.expanduser(
+            self.config.get('state_file', 'state.json'))
+        if not os.path.isabs(state_file):
+            state_file = os.path.join(self.config_dir, state_file)
+        self.state_file = state_file
+        self._restore_state()
+
+        self._rebuild_schedule()
+
+        # Jobs are subprocess/HTTP bound, so run them on a small pool to
+        # keep one slow script from blocking every other job's fire time
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.config.get('max_concurrent', 4),
+            thread_name_prefix='cron-job'
+        )
 
     def load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
             with open(self.config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=YamlLoader)
 
             # Validate required fields
             if 'telegram' not in config:
@@ -215,9 +853,70 @@ class TelegramCronService:
 
             return config
         except Exception as e:
-            logger.error(f"Failed to load config: {e}")
+            logger.error("Failed to load config: %s", e)
             raise
 
+    def _restore_state(self) -> None:
+        """Adopt persisted next_run times for unchanged schedules"""
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        now = datetime.now()
+        for name, job in self.jobs.items():
+            entry = state.get(name)
+            if not entry or entry.get('schedule') != job.schedule:
+                continue
+            try:
+                next_run = datetime.fromisoformat(entry['next_run'])
+            except (KeyError, ValueError):
+                continue
+            if next_run > now:
+                job.next_run = next_run
+                logger.info("Restored next run for job %s: %s", name, next_run)
+
+    def _save_state(self) -> None:
+        """Atomically persist each job's schedule and next_run"""
+        state = {
+            name: {'schedule': job.schedule,
+                   'next_run': job.next_run.isoformat()}
+            for name, job in self.jobs.items() if job.next_run
+        }
+        tmp_path = self.state_file + '.tmp'
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.warning("Could not persist scheduler state: %s", e)
+
+    def _rebuild_schedule(self) -> None:
+        """Precompute the active-job map and rebuild the scheduling heap"""
+        # Filter disabled jobs once here instead of re-checking enabled
+        # on every tick; only active jobs ever enter the heap
+        self._active = {name: job for name, job in self.jobs.items()
+                        if job.enabled}
+        self._heap = [(job.next_run, name)
+                      for name, job in self._active.items()]
+        heapq.heapify(self._heap)
+
+    def reload(self) -> None:
+        """Re-read the config and rebuild jobs and the schedule"""
+        logger.info("Reloading configuration from %s", self.config_path)
+        try:
+            self.config = self.load_config()
+        except Exception:
+            logger.error("Reload aborted; keeping previous configuration")
+            return
+        self.jobs = self.load_jobs()
+        self._restore_state()
+        self._rebuild_schedule()
+        logger.info("Reloaded %d job(s), %d active",
+                    len(self.jobs), len(self._active))
+
     def load_jobs(self) -> Dict[str, CronJob]:
         """Load all jobs from configuration"""
         jobs = {}
@@ -228,12 +927,46 @@ class TelegramCronService:
         for job_name, job_config in self.config['jobs'].items():
             try:
                 jobs[job_name] = CronJob(job_name, job_config, self.config_dir)
-                logger.info(f"Loaded job: {job_name} - Next run: {jobs[job_name].next_run}")
+                logger.info("Loaded job: %s - Next run: %s", job_name, jobs[job_name].next_run)
             except Exception as e:
-                logger.error(f"Failed to load job {job_name}: {e}")
+                logger.error("Failed to load job %s: %s", job_name, e)
 
         return jobs
 
+    def _install_signal_handling(self) -> None:
+        """Route signals through a self-pipe the main loop selects on
+
+        set_wakeup_fd writes each signal number to the pipe, so the
+        selector wakes the instant a signal lands instead of the loop
+        noticing at its next tick: SIGTERM stops within milliseconds and
+        SIGHUP reloads the config without restarting the service.
+        """
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        signal.set_wakeup_fd(self._wake_w, warn_on_full_buffer=False)
+        # The handlers themselves do nothing; the byte on the pipe is
+        # the event, handled synchronously in _wait
+        signal.signal(signal.SIGTERM, lambda signum, frame: None)
+        signal.signal(signal.SIGHUP, lambda signum, frame: None)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+
+    def _wait(self, timeout: float) -> None:
+        """Sleep until the timeout elapses or a signal arrives"""
+        if not self._selector.select(timeout):
+            return
+        try:
+            data = os.read(self._wake_r, 64)
+        except BlockingIOError:
+            return
+        if signal.SIGTERM in data:
+            logger.info("Received SIGTERM - shutting down")
+            self.running = False
+        if signal.SIGHUP in data:
+            logger.info("Received SIGHUP - reloading configuration")
+            self.reload()
+
     def run(self):
         """Main service loop"""
         logger.info("Telegram Cron Service starting...")
@@ -241,34 +974,69 @@ class TelegramCronService:
                                    f"Monitoring {len(self.jobs)} job(s)")
 
         self.running = True
+        self._install_signal_handling()
 
         try:
             while self.running:
-                # Check each job
-                for job_name, job in self.jobs.items():
-                    if job.should_run():
-                        try:
-                            job.execute(self.notifier)
-                        except Exception as e:
-                            logger.error(f"Error executing job {job_name}: {e}")
-                            self.notifier.send_message(
-                                f"❌ <b>Job Execution Error: {job_name}</b>\n"
-                                f"<pre>{str(e)}</pre>"
-                            )
-
-                # Sleep for a bit
-                time.sleep(30)  # Check every 30 seconds
+                if not self._heap:
+                    # No enabled jobs; just wait for shutdown or reload
+                    self._wait(30)
+                    continue
+
+                # Fire everything due as of one clock sample
+                now = datetime.now()
+                fired = False
+                while self._heap and self._heap[0][0] <= now:
+                    fired = True
+                    _, job_name = self._heap[0]
+                    job = self._active[job_name]
+                    self._pool.submit(self._run_job, job_name, job)
+
+                    # Advance the schedule here rather than in the worker
+                    # so the heap entry is correct before the job finishes
+                    job.calculate_next_run()
+                    logger.info("Job %s next run: %s", job_name, job.next_run)
+                    heapq.heapreplace(self._heap, (job.next_run, job_name))
+
+                if fired:
+                    self._save_state()
+
+                # Sleep exactly until the earliest job is due; a signal
+                # interrupts the select immediately, and the 60s cap
+                # keeps us honest across wall-clock jumps (NTP, DST)
+                delta = (self._heap[0][0] - datetime.now()).total_seconds()
+                if delta > 0:
+                    self._wait(min(delta, 60))
 
         except KeyboardInterrupt:
             logger.info("Service interrupted by user")
         finally:
             self.shutdown()
 
+    def _run_job(self, job_name: str, job: CronJob) -> None:
+        """Execute one job on a worker thread, reporting failures"""
+        try:
+            job.execute(self.notifier)
+        except Exception as e:
+            logger.error("Error executing job %s: %s", job_name, e)
+            self.notifier.send_message(
+                f"❌ <b>Job Execution Error: {job_name}</b>\n"
+                f"<pre>{str(e)}</pre>"
+            )
+
     def shutdown(self):
         """Graceful shutdown"""
         logger.info("Telegram Cron Service stopping...")
         self.running = False
+        if self._selector is not None:
+            signal.set_wakeup_fd(-1)
+            self._selector.close()
+            os.close(self._wake_r)
+            os.close(self._wake_w)
+            self._selector = None
+        self._pool.shutdown(wait=True, cancel_futures=True)
         self.notifier.send_message("🛑 <b>Telegram Cron Service Stopped</b>")
+        self.notifier.close()
 
 
 def main():